@@ -4,7 +4,6 @@ import os
 import storage
 import supervisor
 import sys
-import gc
 
 # Notify that boot.py is running
 print("Boot.py: Initializing with read-only filesystem")
@@ -17,106 +16,97 @@ import config_manager
 # attempts to create or modify files
 config_manager._filesystem_readonly = True
 
+# Map of settings.toml keys to config_manager keys
+_TOML_MAP = (
+    # Weather settings
+    ("WEATHER_API_KEY", "WEATHER_API_KEY"),
+    ("WEATHER_CITY", "WEATHER_CITY"),
+    ("WEATHER_UNITS", "WEATHER_UNITS"),
+    # WiFi settings - map from CircuitPython's naming convention
+    ("CIRCUITPY_WIFI_SSID", "WIFI_SSID"),
+    ("CIRCUITPY_WIFI_PASSWORD", "WIFI_PASSWORD"),
+    # Time settings
+    ("TIMEZONE", "TIMEZONE"),
+    ("DST", "DST"),
+    # Device settings
+    ("SETTINGS_MODE", "SETTINGS_MODE"),
+)
+
+
+def _apply(settings, config):
+    """Copy known TOML settings into the config dictionary"""
+    for src, dst in _TOML_MAP:
+        value = settings.get(src)
+        if value is not None:
+            config[dst] = value
+
 # Load TOML settings into memory
-# CircuitPython can read settings.toml even in read-only mode
-try:
-    from adafruit_toml import toml_load
+# CircuitPython can read settings.toml even in read-only mode.
+# CircuitPython 8+ parses it natively via os.getenv(), which avoids probing
+# for adafruit_toml and running the manual parser below.
+_getenv = getattr(os, "getenv", None)
+if _getenv is not None:
+    settings = {}
+    for src, _ in _TOML_MAP:
+        try:
+            settings[src] = _getenv(src)
+        except ValueError:
+            pass  # os.getenv only handles strings and integers
     
-    # Check if settings.toml exists and has content
+    # Map known TOML settings straight into config_manager's in-memory
+    # config, which already holds the defaults. The read-only flag above
+    # keeps it from trying to reload from nonexistent settings.json
+    _apply(settings, config_manager._config)
+    print("Boot.py: Preloaded configuration from os.getenv")
+else:
     try:
-        settings = toml_load("/settings.toml")
-        print("Boot.py: Loaded settings from settings.toml")
-        
-        # Start with default config
-        config = config_manager.DEFAULT_CONFIG.copy()
+        from adafruit_toml import toml_load
         
-        # Map known TOML settings to config_manager format
-        # Weather settings
-        if "WEATHER_API_KEY" in settings:
-            config["WEATHER_API_KEY"] = settings["WEATHER_API_KEY"]
-        if "WEATHER_CITY" in settings:
-            config["WEATHER_CITY"] = settings["WEATHER_CITY"]
-        if "WEATHER_UNITS" in settings:
-            config["WEATHER_UNITS"] = settings["WEATHER_UNITS"]
+        # Check if settings.toml exists and has content
+        try:
+            settings = toml_load("/settings.toml")
+            print("Boot.py: Loaded settings from settings.toml")
             
-        # WiFi settings - map from CircuitPython's naming convention
-        if "CIRCUITPY_WIFI_SSID" in settings:
-            config["WIFI_SSID"] = settings["CIRCUITPY_WIFI_SSID"]
-        if "CIRCUITPY_WIFI_PASSWORD" in settings:
-            config["WIFI_PASSWORD"] = settings["CIRCUITPY_WIFI_PASSWORD"]
-            
-        # Time settings - check for custom timezone
-        if "TIMEZONE" in settings:
-            config["TIMEZONE"] = settings["TIMEZONE"]
-        if "DST" in settings:
-            config["DST"] = settings["DST"]
-            
-        # Device settings
-        if "SETTINGS_MODE" in settings:
-            config["SETTINGS_MODE"] = settings["SETTINGS_MODE"]
-
-        # Store settings in config_manager's memory and set it as already loaded
-        # so it doesn't try to reload from nonexistent settings.json
-        config_manager._config = config
-        print("Boot.py: Preloaded configuration in memory")
-    except OSError as e:
-        print(f"Boot.py: Could not read settings.toml: {e}")
-except ImportError:
-    print("Boot.py: Trying fallback method for TOML")
-    try:
-        # Manual parsing of settings.toml (simplified)
-        with open("/settings.toml", "r") as f:
-            settings_text = f.read()
-            settings = {}
-            
-            # Very basic TOML parsing for key = "value" pairs
-            for line in settings_text.splitlines():
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    try:
-                        key, value = line.split("=", 1)
-                        key = key.strip()
-                        value = value.strip()
-                        # Remove quotes if present
-                        if value.startswith('"') and value.endswith('"'):
-                            value = value[1:-1]
-                        settings[key] = value
-                    except ValueError:
-                        pass  # Skip lines that don't fit key=value format
-            
-            # Convert TOML settings to the format expected by config_manager
-            config = config_manager.DEFAULT_CONFIG.copy()
-            
-            # Map settings similar to above
-            if "WEATHER_API_KEY" in settings:
-                config["WEATHER_API_KEY"] = settings["WEATHER_API_KEY"]
-            if "WEATHER_CITY" in settings:
-                config["WEATHER_CITY"] = settings["WEATHER_CITY"]
-            if "WEATHER_UNITS" in settings:
-                config["WEATHER_UNITS"] = settings["WEATHER_UNITS"]
-                
-            # WiFi settings
-            if "CIRCUITPY_WIFI_SSID" in settings:
-                config["WIFI_SSID"] = settings["CIRCUITPY_WIFI_SSID"]
-            if "CIRCUITPY_WIFI_PASSWORD" in settings:
-                config["WIFI_PASSWORD"] = settings["CIRCUITPY_WIFI_PASSWORD"]
-                
-            # Time settings - check for custom timezone
-            if "TIMEZONE" in settings:
-                config["TIMEZONE"] = settings["TIMEZONE"]
-            if "DST" in settings:
-                config["DST"] = settings["DST"]
+            # Map known TOML settings straight into config_manager's in-memory
+            # config, which already holds the defaults. The read-only flag above
+            # keeps it from trying to reload from nonexistent settings.json
+            _apply(settings, config_manager._config)
+            print("Boot.py: Preloaded configuration in memory")
+        except OSError as e:
+            print(f"Boot.py: Could not read settings.toml: {e}")
+    except ImportError:
+        print("Boot.py: Trying fallback method for TOML")
+        try:
+            # Manual parsing of settings.toml (simplified)
+            with open("/settings.toml", "r") as f:
+                settings_text = f.read()
+                settings = {}
                 
-            # Device settings
-            if "SETTINGS_MODE" in settings:
-                config["SETTINGS_MODE"] = settings["SETTINGS_MODE"]
+                # Very basic TOML parsing for key = "value" pairs, using
+                # find() and slicing to avoid intermediate lists and strings
+                for line in settings_text.splitlines():
+                    eq = line.find("=")
+                    # A '#' before the '=' means the line is a comment, even
+                    # when indented (bare keys can't contain '#')
+                    if eq < 0 or 0 <= line.find("#") < eq:
+                        continue  # Skip comments and lines that aren't key=value
+                    key = line[:eq].strip()
+                    value = line[eq + 1:].strip()
+                    # Remove quotes if present (also drops any trailing comment)
+                    if value[:1] == '"':
+                        end = value.find('"', 1)
+                        if end > 0:
+                            value = value[1:end]
+                    settings[key] = value
                 
-            # Store settings in config_manager's memory
-            config_manager._config = config
-            print("Boot.py: Preloaded configuration using basic parsing")
-    except Exception as e:
-        print(f"Boot.py: Error loading settings: {e}")
-        print("Boot.py: Using default config")
+                # Map settings similar to above into config_manager's memory
+                _apply(settings, config_manager._config)
+                print("Boot.py: Preloaded configuration using basic parsing")
+        except Exception as e:
+            print(f"Boot.py: Error loading settings: {e}")
+            print("Boot.py: Using default config")
 
-# Essential: save available RAM for later operations
-gc.collect()
+# Drop the transient parse results. No gc.collect() here: the VM heap is
+# reset once boot.py finishes, so a full collection would only delay startup
+settings = None
+settings_text = None
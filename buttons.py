@@ -1,24 +1,31 @@
 # buttons.py
 
-import time
 import board
 import digitalio
+import supervisor
+from micropython import const
 import config
+from adafruit_ticks import ticks_diff
 
 # --- Button configuration ---
-# Button debounce time in seconds
-DEBOUNCE_TIME = 0.02
-# Time threshold for long press detection in seconds
-LONG_PRESS_TIME = 0.8
-# Time window for double-click detection in seconds
-DOUBLE_CLICK_TIME = 0.4
+# Number of consecutive identical samples needed to accept a state change
+_DEBOUNCE_SAMPLES = const(4)
+# Time threshold for long press detection in milliseconds
+_LONG_PRESS_MS = const(800)
+# Time window for double-click detection in milliseconds
+_DOUBLE_CLICK_MS = const(400)
 
-# --- Button states ---
-class ButtonState:
-    IDLE = 0       # Button is not pressed
-    PRESSED = 1    # Button is currently pressed
-    RELEASED = 2   # Button was just released
-    DEBOUNCING = 3 # Button is changing state, wait for debounce
+# Bit mask covering the most recent _DEBOUNCE_SAMPLES samples
+_DEBOUNCE_MASK = const((1 << _DEBOUNCE_SAMPLES) - 1)
+
+# --- Button state slots ---
+# Indexes into Button._s; a fixed list is lighter than separate attributes
+_HIST = const(0)          # 8-bit shift register of raw samples (1 = pressed)
+_STABLE = const(1)        # Debounced state: True while the button is held
+_LAST_RAW = const(2)      # Physical state sampled by the last update()
+_PRESS_START = const(3)   # ticks_ms() when the current press was accepted
+_LAST_RELEASE = const(4)  # ticks_ms() of the previous release
+_PREV_COUNT = const(5)    # For double-click detection
 
 # --- Button class ---
 class Button:
@@ -28,77 +35,74 @@ class Button:
         self.pin.pull = pull
         self.active_low = active_low
         
-        # State management
-        self.state = ButtonState.IDLE
-        self.last_state_change = time.monotonic()
-        self.press_start_time = 0
-        self.last_release_time = 0
-        self.previous_press_count = 0  # For double-click detection
+        # is_pressed() returns True if button is currently physically pressed.
+        # active_low never changes, so bake it into the reader once here
+        # rather than branching on every call.
+        pin_in = self.pin
+        if active_low:
+            self.is_pressed = lambda: not pin_in.value
+        else:
+            self.is_pressed = lambda: pin_in.value
+        
+        # State management, indexed by the slot constants above
+        self._s = [0, False, False, 0, 0, 0]
         
-    def is_pressed(self):
-        """Returns True if button is currently physically pressed."""
-        return (not self.pin.value) if self.active_low else self.pin.value
+    @property
+    def is_pressed_cached(self):
+        """Physical state sampled by the last update(), without re-reading the pin."""
+        return self._s[_LAST_RAW]
         
-    def update(self):
+    def update(self, now=None):
         """
-        Update button state machine.
+        Update button debounce state.
         Call this frequently from your main loop.
         
+        Args:
+            now: Current supervisor.ticks_ms() value, read here if not provided
+        
         Returns a tuple of events:
         (pressed, released, long_press, double_click)
         """
-        now = time.monotonic()
         pressed = False
         released = False
         long_press = False
         double_click = False
         
-        # Get current physical state
+        st = self._s
+        
+        # Shift the current physical state into the sample history
         is_pressed_now = self.is_pressed()
+        st[_LAST_RAW] = is_pressed_now
+        hist = ((st[_HIST] << 1) | int(is_pressed_now)) & 0xFF
+        st[_HIST] = hist
         
-        # State machine
-        if self.state == ButtonState.IDLE:
-            if is_pressed_now:
-                # Button was just pressed
-                self.state = ButtonState.DEBOUNCING
-                self.last_state_change = now
-            
-        elif self.state == ButtonState.DEBOUNCING:
-            if now - self.last_state_change >= DEBOUNCE_TIME:
-                # Debounce period over, check if still pressed
-                if is_pressed_now:
-                    # Yes, now we're in pressed state
-                    self.state = ButtonState.PRESSED
-                    self.press_start_time = now
-                    pressed = True
-                else:
-                    # No, must have been noise, go back to idle
-                    self.state = ButtonState.IDLE
-                
-        elif self.state == ButtonState.PRESSED:
-            if not is_pressed_now:
-                # Button was released
-                self.state = ButtonState.RELEASED
-                self.last_state_change = now
+        if not st[_STABLE]:
+            if hist & _DEBOUNCE_MASK == _DEBOUNCE_MASK:
+                # Held for _DEBOUNCE_SAMPLES samples in a row, accept the press
+                st[_STABLE] = True
+                st[_PRESS_START] = supervisor.ticks_ms() if now is None else now
+                pressed = True
                 
-                # Calculate press duration to detect long press
-                press_duration = now - self.press_start_time
-                if press_duration >= LONG_PRESS_TIME:
-                    long_press = True
-                
-                # Check if this is a double click
-                if now - self.last_release_time < DOUBLE_CLICK_TIME:
-                    double_click = True
-                    self.previous_press_count = 0  # Reset after detecting double click
-                else:
-                    self.previous_press_count = 1  # Single click
-                
-                released = True
-                
-        elif self.state == ButtonState.RELEASED:
-            # Update state after release
-            self.last_release_time = now
-            self.state = ButtonState.IDLE
+        elif not hist & _DEBOUNCE_MASK:
+            # Released for _DEBOUNCE_SAMPLES samples in a row
+            st[_STABLE] = False
+            if now is None:
+                now = supervisor.ticks_ms()
+            
+            # Calculate press duration to detect long press
+            press_duration = ticks_diff(now, st[_PRESS_START])
+            if press_duration >= _LONG_PRESS_MS:
+                long_press = True
+            
+            # Check if this is a double click
+            if 0 <= ticks_diff(now, st[_LAST_RELEASE]) < _DOUBLE_CLICK_MS:
+                double_click = True
+                st[_PREV_COUNT] = 0  # Reset after detecting double click
+            else:
+                st[_PREV_COUNT] = 1  # Single click
+            
+            st[_LAST_RELEASE] = now
+            released = True
             
         return pressed, released, long_press, double_click
 
@@ -108,31 +112,18 @@ skip_button = Button(board.GP22)
 back_button = Button(board.GP21)
 
 # Track button actions
-action_table = {
-    # Format: button: {event_type: action}
-    mic_button: {
-        "pressed": None,              # No action on press
-        "released": "toggle_mic",     # Toggle mic on release (normal press)
-        "long_press": None,           # No long press action yet
-        "double_click": None          # No double click action yet
-    },
-    skip_button: {
-        "pressed": None,
-        "released": "skip",
-        "long_press": "fast_forward", # Hold to fast forward (if supported)
-        "double_click": None
-    },
-    back_button: {
-        "pressed": None,
-        "released": "back",
-        "long_press": "rewind",       # Hold to rewind (if supported)
-        "double_click": None
-    }
-}
+# Format: (button, pressed, released, long_press, double_click)
+# Built once at import so check_buttons() only does tuple unpacking per loop
+_ACTIONS = [
+    (mic_button, None, "toggle_mic", None, None),       # Toggle mic on release (normal press)
+    (skip_button, None, "skip", "fast_forward", None),  # Hold to fast forward (if supported)
+    (back_button, None, "back", "rewind", None),        # Hold to rewind (if supported)
+]
 
-def check_buttons(mic_on, toggle_mic_hotkey):
+def check_buttons(mic_on, toggle_mic_hotkey, now=None):
     """
     Checks all buttons using the state machine approach.
+    Pass the main loop's supervisor.ticks_ms() value as 'now' to share one timestamp.
     Returns:
       (new_mic_on, action)
     
@@ -144,19 +135,19 @@ def check_buttons(mic_on, toggle_mic_hotkey):
     action = None
     
     # Check each button
-    for button, actions in action_table.items():
-        pressed, released, long_press, double_click = button.update()
+    for button, p_act, r_act, l_act, d_act in _ACTIONS:
+        pressed, released, long_press, double_click = button.update(now)
         
         # Determine action based on events
         button_action = None
-        if long_press and actions["long_press"]:
-            button_action = actions["long_press"]
-        elif double_click and actions["double_click"]:
-            button_action = actions["double_click"]
-        elif released and actions["released"]:
-            button_action = actions["released"]
-        elif pressed and actions["pressed"]:
-            button_action = actions["pressed"]
+        if long_press and l_act:
+            button_action = l_act
+        elif double_click and d_act:
+            button_action = d_act
+        elif released and r_act:
+            button_action = r_act
+        elif pressed and p_act:
+            button_action = p_act
             
         # Handle special case for mic toggle
         if button_action == "toggle_mic":
@@ -1,35 +1,53 @@
 # code.py
 
 import time
-import wifi_module
+import asyncio
+import supervisor
+from micropython import const
+from adafruit_ticks import ticks_add, ticks_diff
 import time_module
-import gpio
-import rotary
 import buttons
 import oled
 import config
-from adafruit_hid.consumer_control_code import ConsumerControlCode
+import logger
 
-# Constants
-SHOW_MIC_STATE_DURATION = config.get_value("SHOW_MIC_STATE_DURATION", 2.0)
-SHOW_STATUS_DURATION = 3.0  # How long to show status messages (3 seconds)
-WIFI_RETRY_INTERVAL = 300   # Attempt reconnection every 5 minutes if offline
-CLOCK_UPDATE_INTERVAL = 0.5 # Update clock display twice per second when visible
-WEATHER_FETCH_INTERVAL = 30 * 60  # Fetch weather every 30 minutes (or use config)
-SETTINGS_INFO_ROTATE_INTERVAL = 5.0  # Rotate between settings info screens
+# Modules settings mode doesn't use (WiFi, HID, rotary, NTP, weather).
+# They stay None until _import_runtime_modules() loads them for normal mode.
+wifi_module = None
+hid = None
+gpio = None
+rotary = None
+_ntp = None
+_weather = None
+
+# Button action -> ConsumerControlCode to send, filled in with the HID modules
+_ACTION_CC = {}
+
+# Constants (durations in milliseconds)
+SHOW_MIC_STATE_DURATION_MS = int(config.get_value("SHOW_MIC_STATE_DURATION", 2.0) * 1000)
+_SHOW_STATUS_DURATION_MS = const(3000)  # How long to show status messages (3 seconds)
+_SETTINGS_INFO_ROTATE_INTERVAL_MS = const(5000)  # Rotate between settings info screens
+
+# Task intervals (in seconds, passed to asyncio.sleep)
+BUTTON_POLL_INTERVAL = 0.02    # Poll buttons and rotary encoder
+DISPLAY_UPDATE_INTERVAL = 0.5  # Update clock display twice per second when visible
+_WIFI_RETRY_INTERVAL = const(300)  # Attempt reconnection every 5 minutes if offline
+_WEATHER_FETCH_INTERVAL = const(30 * 60)  # Fetch weather every 30 minutes (or use config)
 
 # Variables for tracking state
+# Timestamps are supervisor.ticks_ms() values, which wrap around, so they start
+# at the current tick instead of 0 and are only compared through ticks_diff().
+# ticks_diff() is only meaningful within 2**28 ms (~74 hours), so the mic and
+# status deadlines are None unless armed and are reset once they pass.
+_start_ms = supervisor.ticks_ms()
 mic_on = True
-show_mic_state_until = 0
-show_status_until = 0
+show_mic_state_until = None
+show_status_until = None
 status_message = ""
-last_wifi_retry = 0
-last_clock_update = 0
 last_displayed_time = ""
-last_weather_fetch = 0
 weather_api_configured = False
 settings_mode = False
-settings_info_last_change = 0
+settings_info_last_change = _start_ms
 settings_info_index = 0
 
 # Settings mode info screens - Messages to display in settings mode
@@ -42,30 +60,71 @@ SETTINGS_INFO_SCREENS = [
     "Long-press Back & Skip\nto exit settings mode"
 ]
 
+# SETTINGS_INFO_SCREENS laid out once by oled.prerender_status(), built on
+# first use so normal mode doesn't hold the bitmaps
+_prerendered_screens = None
+# Index of the settings info screen currently on the display
+_last_info_index = -1
+
 # Function to handle WiFi status messages
 def wifi_status_callback(message):
     global show_status_until, status_message
     status_message = message
-    show_status_until = time.monotonic() + SHOW_STATUS_DURATION
+    show_status_until = ticks_add(supervisor.ticks_ms(), _SHOW_STATUS_DURATION_MS)
     oled.display_status(message)
 
-# Register the callback with the wifi module
-wifi_module.set_status_callback(wifi_status_callback)
+# Import the modules that are only needed outside settings mode
+def _import_runtime_modules():
+    """Import WiFi, HID, rotary and the optional network modules for normal mode"""
+    global wifi_module, hid, gpio, rotary, _ntp, _weather
+    
+    if wifi_module is not None:
+        return  # Already imported
+    
+    import wifi_module
+    import hid
+    import gpio
+    import rotary
+    from adafruit_hid.consumer_control_code import ConsumerControlCode
+    
+    # Resolve the codes once instead of looking them up on every button event
+    _ACTION_CC["skip"] = ConsumerControlCode.SCAN_NEXT_TRACK
+    _ACTION_CC["back"] = ConsumerControlCode.SCAN_PREVIOUS_TRACK
+    _ACTION_CC["fast_forward"] = ConsumerControlCode.FAST_FORWARD
+    _ACTION_CC["rewind"] = ConsumerControlCode.REWIND
+    
+    # Optional network modules - resolved once here rather than inside the loop
+    try:
+        import ntp_module as _ntp
+    except ImportError:
+        _ntp = None
+    
+    try:
+        import weather_module as _weather
+    except ImportError:
+        _weather = None
+    
+    # Register the callback with the wifi module
+    wifi_module.set_status_callback(wifi_status_callback)
 
 # Function to display settings mode information
-def display_settings_info():
+def display_settings_info(now):
     """Display information about the settings mode"""
-    global settings_info_index, settings_info_last_change
+    global settings_info_index, settings_info_last_change, _prerendered_screens
+    global _last_info_index
+    
+    if _prerendered_screens is None:
+        _prerendered_screens = tuple(oled.prerender_status(s) for s in SETTINGS_INFO_SCREENS)
     
     # Calculate if we need to switch to the next info screen
-    now = time.monotonic()
-    if now - settings_info_last_change > SETTINGS_INFO_ROTATE_INTERVAL:
+    if ticks_diff(now, settings_info_last_change) > _SETTINGS_INFO_ROTATE_INTERVAL_MS:
         settings_info_last_change = now
         settings_info_index = (settings_info_index + 1) % len(SETTINGS_INFO_SCREENS)
         
-    # Display the current settings info screen
-    info_text = SETTINGS_INFO_SCREENS[settings_info_index]
-    oled.display_status(info_text)
+    # Display the current settings info screen, only redrawing when it changed
+    if settings_info_index != _last_info_index:
+        oled.display_prerendered(_prerendered_screens[settings_info_index])
+        _last_info_index = settings_info_index
 
 # ===== STARTUP SEQUENCE =====
 
@@ -99,7 +158,10 @@ else:
 # 1) Connect to Wi-Fi at Startup (unless in settings mode)
 wifi_connected = False
 if not settings_mode:
+    _import_runtime_modules()
     wifi_connected = wifi_module.ensure_wifi_connected()
+    # Print the module messages now so they stay in order with ours
+    logger.drain()
 
     if not wifi_connected:
         if wifi_module.is_offline_mode():
@@ -107,24 +169,24 @@ if not settings_mode:
         else:
             status_message = "WiFi connection failed"
         
-        show_status_until = time.monotonic() + SHOW_STATUS_DURATION
+        show_status_until = ticks_add(supervisor.ticks_ms(), _SHOW_STATUS_DURATION_MS)
         oled.display_status(status_message)
         time.sleep(2)  # Give user time to read the message
 
 # 2) Initialize NTP time sync if connected and configured
-if wifi_connected and config.get_value("NTP_SYNC_ON_STARTUP", True):
+if _ntp is not None and wifi_connected and config.get_value("NTP_SYNC_ON_STARTUP", True):
     try:
         print("Attempting NTP time sync...")
         oled.display_status("Syncing time...")
-        import ntp_module
-        sync_success = ntp_module.sync_time(force=True)
+        sync_success = _ntp.sync_time(force=True)
+        logger.drain()
         
         if sync_success:
             status_message = "Time synced!"
         else:
             status_message = "Time sync failed"
             
-        show_status_until = time.monotonic() + SHOW_STATUS_DURATION
+        show_status_until = ticks_add(supervisor.ticks_ms(), _SHOW_STATUS_DURATION_MS)
         print(status_message)
         oled.display_status(status_message)
     except Exception as e:
@@ -132,134 +194,131 @@ if wifi_connected and config.get_value("NTP_SYNC_ON_STARTUP", True):
         # Continue without NTP
 
 # 3) Initialize Weather if connected and enabled
-if wifi_connected and config.get_value("WEATHER_ENABLED", True):
+if _weather is not None and wifi_connected and config.get_value("WEATHER_ENABLED", True):
     try:
-        # Import weather module
-        import weather_module
-        
         # Check if API key is configured
-        api_key = weather_module.get_weather_api_key()
+        api_key = _weather.get_weather_api_key()
         if api_key:
             weather_api_configured = True
             oled.display_status("Fetching weather...")
             
             # Try to get initial weather data
-            weather_data = weather_module.fetch_weather()
+            weather_data = _weather.fetch_weather()
+            logger.drain()
             if weather_data:
-                status_message = f"Weather: {weather_data['weather'][0]['main']}"
-                city_name = weather_data['name']
+                status_message = f"Weather: {weather_data['condition']}"
+                city_name = weather_data['city']
                 print(f"Weather for {city_name}: {status_message}")
             else:
                 status_message = "Weather fetch failed"
                 
-            show_status_until = time.monotonic() + SHOW_STATUS_DURATION
+            show_status_until = ticks_add(supervisor.ticks_ms(), _SHOW_STATUS_DURATION_MS)
             oled.display_status(status_message)
         else:
             print("Weather API key not configured")
             
-    except (ImportError, Exception) as e:
+    except Exception as e:
         print(f"Weather init error: {e}")
         # Continue without weather
 
 # 4) Display initial clock after startup sequence
 time.sleep(1)  # Give a moment to read any status message
-oled.display_clock(time_module.format_local_time())
+if not settings_mode:
+    # Settings mode shows its info screens instead. Formatting the time could
+    # also start an NTP sync, which would bring up the WiFi stack.
+    oled.display_clock(time_module.format_local_time())
 
 # ===== MAIN LOOP =====
-print("Startup complete, entering main loop")
-while True:
-    now_monotonic = time.monotonic()
+# Each job runs as its own asyncio task and sleeps until it is next due,
+# instead of one loop polling every job at a fixed rate.
 
-    # Check for settings mode exit combo (long press both back and skip buttons)
-    if settings_mode:
-        # In settings mode, we need to check for the exit combo
-        _, action = buttons.check_buttons(mic_on, lambda: None)  # Don't toggle mic in settings mode
-        
-        # Check if both long presses happened
-        if action == "rewind" or action == "fast_forward":
-            # Check if both buttons are pressed
-            skip_pressed = not buttons.skip_button.is_pressed()
-            back_pressed = not buttons.back_button.is_pressed()
+async def button_task():
+    """Poll the rotary encoder and buttons and send the matching HID controls"""
+    global mic_on, settings_mode, show_mic_state_until, show_status_until
+    global _prerendered_screens
+    
+    while True:
+        now_ms = supervisor.ticks_ms()
+
+        # Check for settings mode exit combo (long press both back and skip buttons)
+        if settings_mode:
+            # In settings mode, we need to check for the exit combo
+            _, action = buttons.check_buttons(mic_on, lambda: None, now_ms)  # Don't toggle mic in settings mode
             
-            if skip_pressed and back_pressed:
-                print("Exit settings mode combo detected")
-                settings_mode = False
-                config.set_value("SETTINGS_MODE", False)
-                oled.display_status("Exiting settings mode")
-                time.sleep(1)
-                oled.display_clock(time_module.format_local_time())
-    else:
-        # Normal mode - handle regular controls
-        
-        # Rotary: volume & play/pause control
-        rotary.check_rotary(gpio.cc)
-
-        # Buttons: check if mic toggle, skip, or back was pressed
-        old_mic_on = mic_on
-        mic_on, action = buttons.check_buttons(mic_on, gpio.toggle_mic_hotkey)
-
-        if mic_on != old_mic_on:
-            oled.display_mic_state(mic_on)
-            show_mic_state_until = now_monotonic + SHOW_MIC_STATE_DURATION
-            # Clear any status message that might be showing
-            show_status_until = 0
-
-        # Handle button actions
-        if action == "skip":
-            gpio.cc.send(ConsumerControlCode.SCAN_NEXT_TRACK)
-        elif action == "back":
-            gpio.cc.send(ConsumerControlCode.SCAN_PREVIOUS_TRACK)
-        elif action == "fast_forward":
-            gpio.cc.send(ConsumerControlCode.FAST_FORWARD)
-        elif action == "rewind":
-            gpio.cc.send(ConsumerControlCode.REWIND)
-
-        # Periodic WiFi retry if in offline mode
-        if wifi_module.is_offline_mode() and now_monotonic - last_wifi_retry > WIFI_RETRY_INTERVAL:
-            last_wifi_retry = now_monotonic
-            print("Attempting to reconnect to WiFi from offline mode...")
-            wifi_connected = wifi_module.retry_connection()
+            # Check if both long presses happened
+            if action == "rewind" or action == "fast_forward":
+                # Check if both buttons are pressed, using the samples
+                # check_buttons() just took rather than reading the pins again
+                skip_pressed = not buttons.skip_button.is_pressed_cached
+                back_pressed = not buttons.back_button.is_pressed_cached
+                
+                if skip_pressed and back_pressed:
+                    print("Exit settings mode combo detected")
+                    _import_runtime_modules()
+                    settings_mode = False
+                    config.set_value("SETTINGS_MODE", False)
+                    oled.display_status("Exiting settings mode")
+                    _prerendered_screens = None  # Settings screens no longer needed
+                    # Rotation wasn't checked in settings mode, so re-arm its deadline
+                    oled.refresh_config()
+                    await asyncio.sleep(1)
+                    oled.display_clock(time_module.format_local_time())
+        else:
+            # Normal mode - handle regular controls
             
-            # If reconnection successful and weather enabled, fetch new data
-            if wifi_connected and weather_api_configured:
-                try:
-                    import weather_module
-                    weather_module.fetch_weather()
-                except Exception as e:
-                    print(f"Weather update error: {e}")
-
-        # Periodic weather update if connected and configured
-        if (wifi_module.is_connected() and 
-            weather_api_configured and 
-            now_monotonic - last_weather_fetch > WEATHER_FETCH_INTERVAL):
-            last_weather_fetch = now_monotonic
-            try:
-                import weather_module
-                print("Updating weather data...")
-                weather_module.fetch_weather()
-            except Exception as e:
-                print(f"Weather update error: {e}")
+            # Rotary: volume & play/pause control
+            rotary.check_rotary()
+
+            # Buttons: check if mic toggle, skip, or back was pressed
+            old_mic_on = mic_on
+            mic_on, action = buttons.check_buttons(mic_on, gpio.toggle_mic_hotkey, now_ms)
 
-    # Display management based on current mode
-    if settings_mode:
-        # In settings mode, always show the settings info
-        display_settings_info()
-    else:
-        # Normal display priority: 1) Mic state, 2) Status messages, 3) Rotation
-        if now_monotonic < show_mic_state_until:
-            # Continue showing mic state
-            pass
-        elif now_monotonic < show_status_until:
-            # Continue showing status message
-            pass
+            if mic_on != old_mic_on:
+                oled.display_mic_state(mic_on)
+                show_mic_state_until = ticks_add(now_ms, SHOW_MIC_STATE_DURATION_MS)
+                # Clear any status message that might be showing
+                show_status_until = None
+
+            # Handle button actions
+            if action is not None:
+                code = _ACTION_CC.get(action)
+                if code is not None:
+                    hid.cc.send(code)
+
+        await asyncio.sleep(BUTTON_POLL_INTERVAL)
+
+
+async def display_task():
+    """Keep the display showing the right content for the current mode"""
+    global last_displayed_time, show_mic_state_until, show_status_until
+    
+    while True:
+        now_ms = supervisor.ticks_ms()
+
+        # Display management based on current mode
+        if settings_mode:
+            # In settings mode, always show the settings info
+            display_settings_info(now_ms)
         else:
-            # Handle display rotation or update time
-            rotated = oled.handle_display_rotation()
+            # Disarm deadlines that have passed so they can't wrap back around
+            if show_mic_state_until is not None and ticks_diff(show_mic_state_until, now_ms) <= 0:
+                show_mic_state_until = None
+            if show_status_until is not None and ticks_diff(show_status_until, now_ms) <= 0:
+                show_status_until = None
             
-            # If not rotated and in time mode, update the clock if needed
-            if not rotated and oled.get_current_mode() == oled.DisplayMode.TIME:
-                if now_monotonic - last_clock_update > CLOCK_UPDATE_INTERVAL:
-                    last_clock_update = now_monotonic
+            # Normal display priority: 1) Mic state, 2) Status messages, 3) Rotation
+            if show_mic_state_until is not None:
+                # Continue showing mic state
+                pass
+            elif show_status_until is not None:
+                # Continue showing status message
+                pass
+            else:
+                # Handle display rotation or update time
+                rotated = oled.handle_display_rotation()
+                
+                # If not rotated and in time mode, update the clock
+                if not rotated and oled.get_current_mode() == oled.DisplayMode.TIME:
                     current_time = time_module.format_local_time()
                     
                     # Only update display if time string has changed
@@ -267,5 +326,57 @@ while True:
                         last_displayed_time = current_time
                         oled.display_clock(current_time)
 
-    # Small delay to regulate loop speed
-    time.sleep(0.05)  # Even more responsive for button presses
+        # Print queued log messages now that this tick's work is done
+        logger.drain()
+
+        await asyncio.sleep(DISPLAY_UPDATE_INTERVAL)
+
+
+async def wifi_task():
+    """Periodically retry WiFi if we gave up and went to offline mode"""
+    global wifi_connected
+    
+    while True:
+        await asyncio.sleep(_WIFI_RETRY_INTERVAL)
+        
+        if settings_mode or not wifi_module.is_offline_mode():
+            continue
+        
+        print("Attempting to reconnect to WiFi from offline mode...")
+        wifi_connected = wifi_module.retry_connection()
+        
+        # If reconnection successful and weather enabled, fetch new data
+        if wifi_connected and weather_api_configured:
+            try:
+                _weather.fetch_weather()
+            except Exception as e:
+                print(f"Weather update error: {e}")
+
+
+async def weather_task():
+    """Periodically refresh the weather data if connected and configured"""
+    while True:
+        await asyncio.sleep(_WEATHER_FETCH_INTERVAL)
+        
+        if settings_mode or not weather_api_configured or not wifi_module.is_connected():
+            continue
+        
+        try:
+            print("Updating weather data...")
+            _weather.fetch_weather()
+        except Exception as e:
+            print(f"Weather update error: {e}")
+
+
+async def main():
+    await asyncio.gather(
+        asyncio.create_task(button_task()),
+        asyncio.create_task(display_task()),
+        asyncio.create_task(wifi_task()),
+        asyncio.create_task(weather_task()),
+    )
+
+
+logger.drain()
+print("Startup complete, entering main loop")
+asyncio.run(main())
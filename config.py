@@ -11,9 +11,10 @@ def get_config():
     return config_manager.get_config()
 
 # Shortcut functions for common operations
-def get_value(key, default=None):
-    """Get a config value with optional default"""
-    return config_manager.get_value(key, default)
+# Bound directly to skip an extra call on hot paths
+get_value = config_manager.get_value
+
+add_change_callback = config_manager.add_change_callback
 
 def set_value(key, value, save_immediately=True):
     """Update a config value and optionally save to disk"""
@@ -1,8 +1,11 @@
 # config_manager.py
 
+import errno
 import json
 import os
-import time
+
+# Read-only filesystem error code (30 in CircuitPython)
+_EROFS = getattr(errno, "EROFS", 30)
 
 # Default configuration values
 DEFAULT_CONFIG = {
@@ -18,6 +21,8 @@ DEFAULT_CONFIG = {
     "SHOW_MIC_STATE_DURATION": 2.0,
     "DISPLAY_ROTATION_INTERVAL": 10,  # Seconds between rotating display content
     "DISPLAY_ROTATION_ENABLED": True,  # Whether to rotate between time and other info
+    "OLED_BUS": "i2c",  # "i2c" (SCL=GP1, SDA=GP0) or "spi" (see oled.py for pins)
+    "OLED_SPI_BAUDRATE": 10000000,  # SSD1306 SPI clock; 10MHz is the datasheet maximum
     
     # HID settings
     "MIC_SHORTCUT": ["LEFT_CONTROL", "LEFT_SHIFT", "M"],
@@ -40,73 +45,77 @@ DEFAULT_CONFIG = {
 # Path to the settings file
 CONFIG_FILE = "/settings.json"
 
-# In-memory cached configuration
-_config = None
-_config_last_modified = 0
-_config_last_check = 0
-_config_check_interval = 10  # Seconds between checking for file changes
+# In-memory cached configuration, seeded with the defaults at import
+# This module is the only writer of CONFIG_FILE, so once loaded the cache stays
+# valid; use reload_config() if the file is edited by something else.
+_config = dict(DEFAULT_CONFIG)
+_config_loaded = False
 _filesystem_readonly = False
 
+# JSON last written to CONFIG_FILE, used to skip rewriting identical contents
+_config_json_cache = None
+# True while set_value(..., save_immediately=False) has left changes unsaved
+_unsaved_changes = False
+
+# Functions called with the key whenever set_value() changes a value
+_change_callbacks = []
+
 
 def get_config():
     """
-    Returns the current configuration, loading it from file if necessary.
+    Returns the current configuration, loading it from file on first use.
     If the file doesn't exist, creates it with default values first.
     
     Returns:
         dict: The current configuration dictionary
     """
-    global _config, _config_last_modified, _config_last_check, _filesystem_readonly
+    global _config_loaded
     
-    now = time.monotonic()
+    # Already loaded, or read-only so the defaults/preloaded values are final
+    if _config_loaded or _filesystem_readonly:
+        return _config
     
-    # If we haven't loaded config yet or it's time to check for updates
-    if _config is None or (now - _config_last_check) > _config_check_interval:
-        _config_last_check = now
-        
-        # If we already know the filesystem is read-only, skip file operations
-        if _filesystem_readonly:
-            # If config is None, use defaults but don't try to save
-            if _config is None:
-                _config = DEFAULT_CONFIG.copy()
-            return _config
-            
-        # Check if config file exists and if it's been modified
-        try:
-            stat = os.stat(CONFIG_FILE)
-            file_modified = stat[8]  # 8 is st_mtime in CircuitPython os.stat
-            
-            # If file was modified since we last loaded it, or we never loaded it
-            if _config is None or file_modified > _config_last_modified:
-                load_config()
-                _config_last_modified = file_modified
-        except OSError:
-            # File doesn't exist, create it with defaults
-            print(f"Config file {CONFIG_FILE} not found, creating with defaults")
-            save_config(DEFAULT_CONFIG)
-            _config = DEFAULT_CONFIG.copy()
+    _config_loaded = True
+    
+    # Check if config file exists
+    try:
+        os.stat(CONFIG_FILE)
+        load_config()
+    except OSError:
+        # File doesn't exist, create it with defaults
+        print(f"Config file {CONFIG_FILE} not found, creating with defaults")
+        save_config()
     
     return _config
 
 
+def reload_config():
+    """
+    Re-read the configuration from the settings file.
+    Only needed if the file was changed outside of this module.
+    
+    Returns:
+        dict: The reloaded configuration dictionary
+    """
+    global _config_loaded
+    _config_loaded = False
+    return get_config()
+
+
 def load_config():
     """
     Load configuration from the settings file.
     If the file doesn't exist or has invalid JSON, load the defaults.
     """
-    global _config
-    
     try:
         with open(CONFIG_FILE, "r") as f:
             file_content = f.read()
             if file_content.strip():  # Make sure file isn't empty
                 loaded_config = json.loads(file_content)
                 
-                # Start with defaults, then update with loaded values
+                # _config already holds the defaults, so update in place
                 # This ensures any new config options get default values
-                merged_config = DEFAULT_CONFIG.copy()
-                merged_config.update(loaded_config)
-                _config = merged_config
+                _config.update(loaded_config)
                 
                 print(f"Loaded configuration from {CONFIG_FILE}")
                 return
@@ -114,7 +123,6 @@ def load_config():
         print(f"Error loading config: {e}")
     
     # If we get here, either the file doesn't exist, is empty, or has invalid JSON
-    _config = DEFAULT_CONFIG.copy()
     print("Using default configuration")
 
 
@@ -129,7 +137,7 @@ def save_config(config=None):
         bool: True if the save was successful or if using in-memory only config,
               False if save failed for a reason other than read-only filesystem
     """
-    global _config, _config_last_modified, _filesystem_readonly
+    global _config, _filesystem_readonly, _config_json_cache, _unsaved_changes
     
     # If we already know filesystem is read-only, don't try to save
     if _filesystem_readonly:
@@ -142,30 +150,23 @@ def save_config(config=None):
     # If no config provided, use the current one
     if config is None:
         config = _config
-        
-    # If still None, use defaults
-    if config is None:
-        config = DEFAULT_CONFIG.copy()
-        _config = config
     
     try:
-        # Convert to JSON and save
+        # Convert to JSON and save, unless the file already holds exactly this
         json_str = json.dumps(config)
+        if json_str == _config_json_cache:
+            _unsaved_changes = False
+            return True
         with open(CONFIG_FILE, "w") as f:
             f.write(json_str)
+        _config_json_cache = json_str
+        _unsaved_changes = False
         
-        # Update the last modified time
-        try:
-            stat = os.stat(CONFIG_FILE)
-            _config_last_modified = stat[8]  # 8 is st_mtime
-        except OSError:
-            pass
-            
         print(f"Saved configuration to {CONFIG_FILE}")
         return True
     except OSError as e:
-        # Check for read-only filesystem (error code 30 in CircuitPython)
-        if getattr(e, 'args', [None])[0] == 30:  # Read-only filesystem
+        # Check for read-only filesystem
+        if e.args and e.args[0] == _EROFS:
             _filesystem_readonly = True
             print("Filesystem is read-only, using in-memory config only")
             # Still update the in-memory config
@@ -190,8 +191,11 @@ def get_value(key, default=None):
     Returns:
         The value for the given key, or the default if not found
     """
-    config = get_config()
-    return config.get(key, default)
+    # Fast path: config is cached once loaded
+    if _config_loaded or _filesystem_readonly:
+        return _config.get(key, default)
+    
+    return get_config().get(key, default)
 
 
 def set_value(key, value, save_immediately=True):
@@ -204,19 +208,40 @@ def set_value(key, value, save_immediately=True):
         save_immediately: If True, saves to disk immediately. 
                          If False, only updates in-memory config.
     
+    Setting a key to the value it already has does nothing, apart from
+    saving changes an earlier save_immediately=False call left unsaved.
+    
     Returns:
         bool: True if successful, False if save failed (always True if save_immediately=False)
     """
-    global _config
+    global _unsaved_changes
     
     # Ensure config is loaded
     config = get_config()
     
+    if key in config and config[key] == value:
+        # Nothing changed, so only save if earlier changes are still pending
+        if save_immediately and _unsaved_changes and not _filesystem_readonly:
+            return save_config()
+        return True
+    
     # Update the value
     config[key] = value
     
-    # Save if requested
-    if save_immediately:
+    for callback in _change_callbacks:
+        callback(key)
+    
+    # Save if requested (nothing to write on a read-only filesystem)
+    if save_immediately and not _filesystem_readonly:
         return save_config()
     
+    _unsaved_changes = True
     return True
+
+
+def add_change_callback(callback_func):
+    """
+    Register a function to be called when set_value() changes a value.
+    The callback should accept the changed key as a string parameter.
+    """
+    _change_callbacks.append(callback_func)
@@ -1,15 +1,9 @@
 # gpio.py
 
-import usb_hid
-from adafruit_hid.consumer_control import ConsumerControl
-from adafruit_hid.keyboard import Keyboard
 from adafruit_hid.keycode import Keycode
 
 import config
-
-# Create HID objects
-cc = ConsumerControl(usb_hid.devices)
-kbd = Keyboard(usb_hid.devices)
+from hid import kbd
 
 # Build a keycode map for your mic shortcut
 KEY_MAP = {
@@ -28,8 +22,9 @@ def parse_shortcut(shortcut_list):
     return [KEY_MAP[item] for item in shortcut_list if item in KEY_MAP]
 
 # Convert the user’s config string array (e.g. ["LEFT_CONTROL","LEFT_SHIFT","M"])
-# into actual Keycodes.
-MIC_SHORTCUT_CODES = parse_shortcut(config.config["MIC_SHORTCUT"])
+# into actual Keycodes. Stored as a tuple so *-unpacking it on each press
+# can pass it straight through without converting a list first.
+MIC_SHORTCUT_CODES = tuple(parse_shortcut(config.config["MIC_SHORTCUT"]))
 
 
 def toggle_mic_hotkey():
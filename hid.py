@@ -0,0 +1,10 @@
+# hid.py
+
+import usb_hid
+from adafruit_hid.consumer_control import ConsumerControl
+from adafruit_hid.keyboard import Keyboard
+
+# The single set of HID devices, shared by gpio, rotary and code.py so each
+# report buffer is allocated once
+cc = ConsumerControl(usb_hid.devices)
+kbd = Keyboard(usb_hid.devices)
@@ -0,0 +1,45 @@
+# logger.py
+
+from micropython import const
+
+# print() over USB serial blocks while the host isn't reading, so messages
+# are queued here and only printed by drain() when the main loop is idle
+
+# Maximum number of queued messages; the oldest are overwritten first
+_MAX = const(32)
+
+# Set to True to also log verbose messages guarded by `if logger.DEBUG:`
+DEBUG = False
+
+# Fixed-size ring buffer: _head is the slot of the oldest message and
+# _count how many slots from there are filled
+_buf = [None] * _MAX
+_head = 0
+_count = 0
+
+
+def log(message):
+    """
+    Queue a message to be printed by the next drain().
+    """
+    global _head, _count
+    if _count < _MAX:
+        _buf[(_head + _count) % _MAX] = message
+        _count += 1
+    else:
+        # Full: overwrite the oldest message
+        _buf[_head] = message
+        _head = (_head + 1) % _MAX
+
+
+def drain():
+    """
+    Print all queued messages and empty the queue.
+    Call this from the main loop when there is nothing else to do.
+    """
+    global _head, _count
+    while _count:
+        print(_buf[_head])
+        _buf[_head] = None
+        _head = (_head + 1) % _MAX
+        _count -= 1
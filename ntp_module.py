@@ -1,10 +1,13 @@
 # ntp_module.py
 
 import time
+from micropython import const
 import socketpool
 import wifi_module
 import adafruit_ntp
 import config
+import logger
+import time_module
 
 # Cache for the NTP object
 _ntp = None
@@ -13,7 +16,7 @@ _ntp = None
 _last_sync_time = 0
 
 # Default sync interval (how often to resync with NTP server)
-_sync_interval_seconds = 24 * 60 * 60  # Once per day by default
+_sync_interval_seconds = const(24 * 60 * 60)  # Once per day by default
 
 # Flag to track if the RTC has been set at least once
 _rtc_synced = False
@@ -34,19 +37,20 @@ def get_ntp_client():
     
     # Check if we're connected to Wi-Fi
     if not wifi_module.is_connected():
-        print("Wi-Fi not connected, can't create NTP client")
+        logger.log("Wi-Fi not connected, can't create NTP client")
         return None
     
     try:
         # Get the socket pool that wifi_module already created
         pool = wifi_module.get_socket_pool()
         if pool is None:
-            print("No socket pool available")
+            logger.log("No socket pool available")
             return None
         
         # Create the NTP client
         ntp_servers = config.config.get("NTP_SERVERS", ["pool.ntp.org", "time.google.com"])
-        print(f"Creating NTP client with servers: {ntp_servers}")
+        if logger.DEBUG:
+            logger.log(f"Creating NTP client with servers: {ntp_servers}")
         _ntp = adafruit_ntp.NTP(pool, server=ntp_servers[0])
         
         # Set fallback servers if first one fails
@@ -55,7 +59,7 @@ def get_ntp_client():
             
         return _ntp
     except Exception as e:
-        print(f"Error creating NTP client: {e}")
+        logger.log(f"Error creating NTP client: {e}")
         return None
 
 
@@ -82,16 +86,16 @@ def sync_time(force=False):
     try:
         # Ensure Wi-Fi is connected
         if not wifi_module.is_connected():
-            print("Wi-Fi not connected, attempting to connect")
+            logger.log("Wi-Fi not connected, attempting to connect")
             wifi_module.ensure_wifi_connected()
             if not wifi_module.is_connected():
-                print("Failed to connect to Wi-Fi")
+                logger.log("Failed to connect to Wi-Fi")
                 return False
         
         # Get NTP client
         ntp = get_ntp_client()
         if ntp is None:
-            print("Failed to get NTP client")
+            logger.log("Failed to get NTP client")
             return False
         
         # Update the last sync time
@@ -101,21 +105,33 @@ def sync_time(force=False):
         try:
             # This is where the actual NTP query happens
             ntp_datetime = ntp.datetime
-            print(f"NTP time received: {ntp_datetime}")
+            if logger.DEBUG:
+                logger.log(f"NTP time received: {ntp_datetime}")
             
             # Update flag that we've successfully synced at least once
             _rtc_synced = True
             
             return True
         except Exception as e:
-            print(f"Error getting time from NTP server: {e}")
+            logger.log(f"Error getting time from NTP server: {e}")
             return False
             
     except Exception as e:
-        print(f"Time sync failed: {e}")
+        logger.log(f"Time sync failed: {e}")
         return False
 
 
+def is_sync_due():
+    """
+    Returns whether sync_time() would contact the NTP server: True until the
+    RTC has been synced once, then again each time the sync interval elapses.
+    """
+    if not _rtc_synced:
+        return True
+    interval = config.config.get("NTP_SYNC_INTERVAL", _sync_interval_seconds)
+    return (time.monotonic() - _last_sync_time) >= interval
+
+
 def is_rtc_synced():
     """
     Returns whether the RTC has been synced at least once since boot.
@@ -134,12 +150,5 @@ def get_current_datetime():
     if not _rtc_synced:
         sync_time()
     
-    # Get current time
-    utc_now = time.localtime()
-    
-    # Apply timezone offset
-    from time_module import get_utc_offset_seconds
-    offset_seconds = get_utc_offset_seconds()
-    local_secs = time.mktime(utc_now) + offset_seconds
-    
-    return time.localtime(local_secs)
+    # Apply timezone offset to the current epoch seconds
+    return time.localtime(time.time() + time_module._UTC_OFFSET)
@@ -1,28 +1,60 @@
 # oled.py
 
-import time
 import board
 import busio
 import displayio
 import terminalio
-from adafruit_display_text import label
+import supervisor
+from micropython import const
+from adafruit_ticks import ticks_add, ticks_diff
+from adafruit_display_text import label, bitmap_label
 import adafruit_displayio_ssd1306
 import config
+import time_module
 
 # Release any displays in case something was initialized before
 displayio.release_displays()
 
-# I2C + SSD1306 Setup
-i2c = busio.I2C(board.GP1, board.GP0)  # SCL=GP1, SDA=GP0
-display_bus = displayio.I2CDisplay(i2c, device_address=0x3C)
+# Display bus: "spi" refreshes a full frame in ~1ms versus tens of ms over
+# I2C, but needs an SSD1306 module wired for 4-wire SPI. Defaults to "i2c".
+OLED_BUS = config.get_value("OLED_BUS", "i2c")
 
-WIDTH = 128
-HEIGHT = 64
+# SPI clock for the SSD1306. The datasheet's 100ns minimum serial clock cycle
+# allows up to 10MHz; faster rates are out of spec and can be opted into with
+# OLED_SPI_BAUDRATE once a particular module has been checked to cope
+SPI_BAUDRATE = config.get_value("OLED_SPI_BAUDRATE", 10000000)
+# Run the I2C bus at 1MHz (Fast-mode Plus) instead of the 100kHz default so
+# each refresh spends less time on the wire; most SSD1306 modules manage ~700kHz
+I2C_FREQUENCY = const(1000000)
+
+if OLED_BUS == "spi":
+    # SPI + SSD1306 Setup (SPI1 pins, clear of the rotary encoder on GP16-18)
+    spi = busio.SPI(clock=board.GP10, MOSI=board.GP11)  # SCK=GP10, MOSI=GP11
+    display_bus = displayio.FourWire(
+        spi,
+        command=board.GP12,      # D/C
+        chip_select=board.GP13,  # CS
+        reset=board.GP14,        # RES
+        baudrate=SPI_BAUDRATE
+    )
+else:
+    # I2C + SSD1306 Setup
+    i2c = busio.I2C(board.GP1, board.GP0, frequency=I2C_FREQUENCY)  # SCL=GP1, SDA=GP0
+    display_bus = displayio.I2CDisplay(i2c, device_address=0x3C)
+
+WIDTH = const(128)
+HEIGHT = const(64)
 
 display = adafruit_displayio_ssd1306.SSD1306(
     display_bus, width=WIDTH, height=HEIGHT
 )
 
+# Refresh explicitly once each display_* call has finished changing the
+# screen. displayio only sends the dirty area on refresh, so one refresh
+# per update sends the union of all changes in a single partial update,
+# rather than auto-refresh possibly sending a half-updated frame.
+display.auto_refresh = False
+
 # ===== Display Groups and Labels =====
 
 # Main display group
@@ -39,6 +71,67 @@ main_label = label.Label(
     anchored_position=(WIDTH // 2, HEIGHT // 2)
 )
 
+# Clock display - a row of tiles from a glyph atlas rendered once at boot.
+# A scale=2 label re-rasterizes and upscales its glyphs on every text change;
+# the clock only ever shows these characters, so they are scaled up front
+# and each second just swaps tile indices.
+CLOCK_GLYPHS = "0123456789: APM"
+CLOCK_CHARS = const(11)  # "HH:MM:SS AM"
+CLOCK_SCALE = const(2)
+
+_CLOCK_INDEX = {ch: i for i, ch in enumerate(CLOCK_GLYPHS)}
+_CLOCK_BLANK = _CLOCK_INDEX[" "]
+
+
+def _build_clock_atlas():
+    """Render CLOCK_GLYPHS from terminalio.FONT into one upscaled bitmap"""
+    font = terminalio.FONT
+    glyph_w, glyph_h = font.get_bounding_box()[:2]
+    tile_w = glyph_w * CLOCK_SCALE
+    tile_h = glyph_h * CLOCK_SCALE
+    atlas = displayio.Bitmap(tile_w * len(CLOCK_GLYPHS), tile_h, 2)
+    
+    for i, ch in enumerate(CLOCK_GLYPHS):
+        glyph = font.get_glyph(ord(ch))
+        source = glyph.bitmap
+        per_row = source.width // glyph_w
+        src_x = (glyph.tile_index % per_row) * glyph_w
+        src_y = (glyph.tile_index // per_row) * glyph_h
+        dst_x = i * tile_w
+        for y in range(glyph_h):
+            for x in range(glyph_w):
+                if source[src_x + x, src_y + y]:
+                    px = dst_x + x * CLOCK_SCALE
+                    py = y * CLOCK_SCALE
+                    for dy in range(CLOCK_SCALE):
+                        for dx in range(CLOCK_SCALE):
+                            atlas[px + dx, py + dy] = 1
+    
+    return atlas, tile_w, tile_h
+
+
+_clock_atlas, _clock_tile_w, _clock_tile_h = _build_clock_atlas()
+
+_clock_palette = displayio.Palette(2)
+_clock_palette[0] = 0x000000
+_clock_palette[1] = 0xFFFFFF
+_clock_palette.make_transparent(0)
+
+clock_grid = displayio.TileGrid(
+    _clock_atlas,
+    pixel_shader=_clock_palette,
+    width=CLOCK_CHARS,
+    height=1,
+    tile_width=_clock_tile_w,
+    tile_height=_clock_tile_h,
+    default_tile=_CLOCK_BLANK,
+    x=(WIDTH - CLOCK_CHARS * _clock_tile_w) // 2,
+    y=(HEIGHT - _clock_tile_h) // 2
+)
+
+# Text currently laid out in clock_grid, right-aligned to CLOCK_CHARS
+_clock_text = " " * CLOCK_CHARS
+
 # Status message display - smaller text
 status_label = label.Label(
     font=terminalio.FONT,
@@ -77,30 +170,93 @@ splash.append(main_label)
 
 # ===== Display mode tracking =====
 
-# Display modes
+# Display modes (small ints so mode checks are integer compares)
 class DisplayMode:
-    TIME = "time"
-    STATUS = "status"
-    MIC = "mic"
-    WEATHER = "weather"
+    TIME = 0
+    STATUS = 1
+    MIC = 2
+    WEATHER = 3
+
+# Temporary displays that rotation must not replace
+_TRANSIENT_MODES = (DisplayMode.STATUS, DisplayMode.MIC)
 
-# Current display mode
-_current_mode = DisplayMode.TIME
+# Current display mode. The "INIT" label counts as a status message, so the
+# first display_clock() swaps in clock_grid.
+_current_mode = DisplayMode.STATUS
 
-# Display rotation
+# Display rotation; _next_rotation is a supervisor.ticks_ms() deadline
 _next_rotation = 0
 _current_rotation_index = 0
-_rotation_items = [DisplayMode.TIME, DisplayMode.WEATHER]
+_rotation_items = [DisplayMode.TIME]  # Built by _rebuild_rotation_items()
+
+# Rotation settings read on every rotation check, cached by refresh_config()
+_rotation_enabled = True
+_rotation_interval_ms = 10000
+
+
+def _rebuild_rotation_items():
+    """Rebuild the rotation item list from config"""
+    global _current_rotation_index
+    
+    # Always includes TIME, conditionally includes others
+    while len(_rotation_items) > 1:
+        _rotation_items.pop()
+    
+    # Add weather if enabled and we have an API key
+    if (config.get_value("WEATHER_ENABLED", True) and
+        config.get_value("WEATHER_API_KEY", "")):
+        _rotation_items.append(DisplayMode.WEATHER)
+    
+    _current_rotation_index %= len(_rotation_items)
+
+
+def refresh_config():
+    """
+    Re-read the cached display rotation settings from config.
+    Runs automatically when one of _ROTATION_KEYS changes through
+    config.set_value(); call it after editing config any other way.
+    """
+    global _rotation_enabled, _rotation_interval_ms, _next_rotation
+    _rotation_enabled = config.get_value("DISPLAY_ROTATION_ENABLED", True)
+    _rotation_interval_ms = int(config.get_value("DISPLAY_ROTATION_INTERVAL", 10) * 1000)
+    _rebuild_rotation_items()
+    
+    # Rotate on the next check. This also re-arms a deadline that has gone
+    # stale while rotation was disabled, since ticks_diff() only covers ~74 hours.
+    _next_rotation = supervisor.ticks_ms()
+
+
+# Config keys the cached rotation settings depend on
+_ROTATION_KEYS = (
+    "DISPLAY_ROTATION_ENABLED",
+    "DISPLAY_ROTATION_INTERVAL",
+    "WEATHER_ENABLED",
+    "WEATHER_API_KEY",
+)
+
+
+def _on_config_change(key):
+    """Refresh the rotation settings when config.set_value() changes one"""
+    if key in _ROTATION_KEYS:
+        refresh_config()
+
+
+refresh_config()
+config.add_change_callback(_on_config_change)
+
+# weather_module pulls in the WiFi stack, which settings mode never uses,
+# so it is imported on the first weather rotation and reused after that
+_weather_module = None
 
 
 def _clear_display():
-    """Remove all labels from the display"""
-    if main_label in splash:
-        splash.remove(main_label)
-    if status_label in splash:
-        splash.remove(status_label)
-    if weather_group in splash:
-        splash.remove(weather_group)
+    """
+    Remove the current label from the display.
+    Every display mode shows exactly one child of splash, so popping it
+    avoids scanning the group for each label that might be shown.
+    """
+    if len(splash):
+        splash.pop()
 
 
 def display_mic_state(is_on: bool):
@@ -118,20 +274,38 @@ def display_mic_state(is_on: bool):
         main_label.text = "MIC OFF"
     
     _current_mode = DisplayMode.MIC
+    display.refresh()
 
 
 def display_clock(time_str: str):
     """
     Displays the passed-in time string (e.g. '12:01:05 AM').
+    Characters outside CLOCK_GLYPHS are shown as blanks.
     """
-    global _current_mode
+    global _current_mode, _clock_text
+    
+    # Right-align so the minutes and AM/PM stay put when the hour is one digit
+    text = time_str[-CLOCK_CHARS:]
+    text = " " * (CLOCK_CHARS - len(text)) + text
+    
+    # Nothing changed: skip the tile update so the display isn't refreshed
+    if _current_mode == DisplayMode.TIME and text == _clock_text:
+        return
     
     if _current_mode != DisplayMode.TIME:
         _clear_display()
-        splash.append(main_label)
+        splash.append(clock_grid)
         _current_mode = DisplayMode.TIME
-        
-    main_label.text = time_str
+    
+    # Only touch the tiles whose character changed
+    old_text = _clock_text
+    for i in range(CLOCK_CHARS):
+        ch = text[i]
+        if ch != old_text[i]:
+            clock_grid[i] = _CLOCK_INDEX.get(ch, _CLOCK_BLANK)
+    
+    _clock_text = text
+    display.refresh()
 
 
 def display_status(message: str):
@@ -146,6 +320,36 @@ def display_status(message: str):
     
     status_label.text = message
     _current_mode = DisplayMode.STATUS
+    display.refresh()
+
+
+def prerender_status(message: str):
+    """
+    Lay out a status message once for repeated use with display_prerendered().
+    The text is rendered into its own bitmap, so showing it again later
+    does no text layout at all.
+    """
+    return bitmap_label.Label(
+        font=terminalio.FONT,
+        text=message,
+        color=0xFFFFFF,
+        scale=1,
+        anchor_point=(0.5, 0.5),
+        anchored_position=(WIDTH // 2, HEIGHT // 2)
+    )
+
+
+def display_prerendered(prerendered):
+    """
+    Display a status message returned by prerender_status().
+    """
+    global _current_mode
+    
+    _clear_display()
+    splash.append(prerendered)
+    
+    _current_mode = DisplayMode.STATUS
+    display.refresh()
 
 
 def display_weather(city, temp_condition):
@@ -166,6 +370,7 @@ def display_weather(city, temp_condition):
     weather_temp_label.text = temp_condition
     
     _current_mode = DisplayMode.WEATHER
+    display.refresh()
 
 
 def get_current_mode():
@@ -181,33 +386,23 @@ def handle_display_rotation():
     Returns:
         bool: True if display was rotated, False otherwise
     """
-    global _next_rotation, _current_rotation_index
+    global _next_rotation, _current_rotation_index, _weather_module
     
     # Check if rotation is enabled
-    if not config.get_value("DISPLAY_ROTATION_ENABLED", True):
+    if not _rotation_enabled:
         return False
     
     # Check if it's time to rotate
-    now = time.monotonic()
-    if now < _next_rotation:
+    now = supervisor.ticks_ms()
+    if ticks_diff(_next_rotation, now) > 0:
         return False
     
-    # Get the rotation interval from config
-    interval = config.get_value("DISPLAY_ROTATION_INTERVAL", 10)
-    _next_rotation = now + interval
+    _next_rotation = ticks_add(now, _rotation_interval_ms)
     
     # If we're showing a temporary display (status or mic), don't rotate
-    if _current_mode in [DisplayMode.STATUS, DisplayMode.MIC]:
+    if _current_mode in _TRANSIENT_MODES:
         return False
     
-    # Build the rotation item list (always includes TIME, conditionally includes others)
-    _rotation_items = [DisplayMode.TIME]
-    
-    # Add weather if enabled and we have an API key
-    if (config.get_value("WEATHER_ENABLED", True) and 
-        config.get_value("WEATHER_API_KEY", "")):
-        _rotation_items.append(DisplayMode.WEATHER)
-    
     # If there's only one item, no need to rotate
     if len(_rotation_items) <= 1:
         return False
@@ -219,8 +414,9 @@ def handle_display_rotation():
     # Handle the rotation based on next mode
     if next_mode == DisplayMode.WEATHER:
         try:
-            import weather_module
-            city_line, temp_line = weather_module.format_weather_for_display()
+            if _weather_module is None:
+                import weather_module as _weather_module
+            city_line, temp_line = _weather_module.format_weather_for_display()
             if city_line and temp_line:
                 display_weather(city_line, temp_line)
                 return True
@@ -229,7 +425,6 @@ def handle_display_rotation():
             # Fall back to time if we can't display weather
             display_clock(time_module.format_local_time())
     elif next_mode == DisplayMode.TIME:
-        import time_module
         display_clock(time_module.format_local_time())
         return True
     
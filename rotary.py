@@ -1,49 +1,48 @@
 # rotary.py
 
-import time
 import board
-import digitalio
+import keypad
+import rotaryio
 from adafruit_hid.consumer_control_code import ConsumerControlCode
+from hid import cc
 
-# Rotary pins: CLK, DT, Switch
-clk = digitalio.DigitalInOut(board.GP16)
-clk.direction = digitalio.Direction.INPUT
-clk.pull = digitalio.Pull.UP
+# Rotary pins: CLK, DT decoded in hardware (PIO state machine on RP2040),
+# so no pulses are missed between main loop polls
+encoder = rotaryio.IncrementalEncoder(board.GP16, board.GP17, divisor=4)
 
-dt = digitalio.DigitalInOut(board.GP17)
-dt.direction = digitalio.Direction.INPUT
-dt.pull = digitalio.Pull.UP
+# Encoder switch, scanned and debounced in the background by keypad
+encoder_sw = keypad.Keys((board.GP18,), value_when_pressed=False, pull=True)
 
-encoder_sw = digitalio.DigitalInOut(board.GP18)
-encoder_sw.direction = digitalio.Direction.INPUT
-encoder_sw.pull = digitalio.Pull.UP
+# Track the last encoder position we acted on
+last_position = encoder.position
 
-# Track the last known state of CLK
-last_clk = clk.value
 
-
-def check_rotary(consumer_control):
+def check_rotary():
     """
     Checks the rotary encoder for rotation or button press events.
     If rotated clockwise, send VOLUME_INCREMENT.
     If rotated counter-clockwise, send VOLUME_DECREMENT.
+    One step is sent per detent moved since the last check.
     If switch pressed, send PLAY_PAUSE.
     """
-    global last_clk
+    global last_position
+
+    position = encoder.position
+    delta = position - last_position
+    if delta:
+        last_position = position
 
-    current_clk = clk.value
-    if current_clk != last_clk:
-        # Determine rotation direction
-        if dt.value != current_clk:
-            # Clockwise
-            consumer_control.send(ConsumerControlCode.VOLUME_INCREMENT)
-        else:
-            # Counter-clockwise
-            consumer_control.send(ConsumerControlCode.VOLUME_DECREMENT)
+        # Clockwise
+        while delta > 0:
+            cc.send(ConsumerControlCode.VOLUME_INCREMENT)
+            delta -= 1
 
-        last_clk = current_clk
+        # Counter-clockwise
+        while delta < 0:
+            cc.send(ConsumerControlCode.VOLUME_DECREMENT)
+            delta += 1
 
     # Encoder switch -> Play/Pause
-    if not encoder_sw.value:  # active low
-        consumer_control.send(ConsumerControlCode.PLAY_PAUSE)
-        time.sleep(0.3)
+    event = encoder_sw.events.get()
+    if event and event.pressed:
+        cc.send(ConsumerControlCode.PLAY_PAUSE)
@@ -2,11 +2,21 @@
 
 import time
 import config
+import logger
 
 # Track when we last tried to sync time
 _last_sync_attempt = 0
 
-def get_utc_offset_seconds():
+# ntp_module imports this module and pulls in the WiFi stack, so it is
+# imported on the first sync attempt and reused after that
+_ntp_module = None
+
+# Last string built by format_local_time() and the RTC second it was built for
+_last_fmt_sec = None
+_last_fmt_str = ""
+
+
+def _compute_offset():
     """
     Returns the UTC offset in seconds based on TIMEZONE and DST settings.
     """
@@ -27,44 +37,82 @@ def get_utc_offset_seconds():
     return base_offset * 3600  # Convert hours to seconds
 
 
+# UTC offset in seconds, computed once from config; call reload_tz() after
+# changing TIMEZONE or DST
+_UTC_OFFSET = _compute_offset()
+
+# Seconds between NTP attempts from get_local_time(); see refresh_config()
+_ntp_retry_interval = config.get_value("NTP_SYNC_RETRY_INTERVAL", 300)
+
+
+def refresh_config():
+    """
+    Re-read the cached time settings from config.
+    Call this after changing TIMEZONE, DST or NTP_SYNC_RETRY_INTERVAL.
+    """
+    global _ntp_retry_interval
+    _ntp_retry_interval = config.get_value("NTP_SYNC_RETRY_INTERVAL", 300)
+    reload_tz()
+
+
+def reload_tz():
+    """
+    Recompute the cached UTC offset after TIMEZONE or DST has changed.
+    """
+    global _UTC_OFFSET, _last_fmt_sec
+    _UTC_OFFSET = _compute_offset()
+    _last_fmt_sec = None  # Cached time string used the old offset
+
+
+def get_utc_offset_seconds():
+    """
+    Returns the UTC offset in seconds based on TIMEZONE and DST settings.
+    """
+    return _UTC_OFFSET
+
+
 def get_local_time():
     """
     Returns a local time struct_time, using NTP if available.
     
     If NTP is not available or sync fails, falls back to the internal clock.
     """
-    global _last_sync_attempt
+    global _last_sync_attempt, _ntp_module
     
     # Check if we should attempt an NTP sync
     now = time.monotonic()
-    retry_interval = config.config.get("NTP_SYNC_RETRY_INTERVAL", 300)
     
-    # Periodically try to sync with NTP
-    if now - _last_sync_attempt > retry_interval:
+    # Periodically try to sync with NTP, but only while the RTC needs it:
+    # once synced, nothing goes on the network until the sync interval is up
+    if now - _last_sync_attempt > _ntp_retry_interval:
         _last_sync_attempt = now
         try:
-            # Import only when needed to avoid import loops
-            import ntp_module
-            if ntp_module.sync_time():
-                # Successfully synced, use NTP time
-                return ntp_module.get_current_datetime()
+            if _ntp_module is None:
+                import ntp_module as _ntp_module
+            if _ntp_module.is_sync_due():
+                _ntp_module.sync_time()
         except (ImportError, Exception) as e:
-            print(f"NTP sync attempt error: {e}")
+            logger.log(f"NTP sync attempt error: {e}")
             # Fall back to internal time
     
-    # If we reach here, either NTP sync didn't happen or failed
-    # Calculate local time using internal clock and config offset
-    offset_seconds = get_utc_offset_seconds()
-    utc_now = time.localtime()
-    local_secs = time.mktime(utc_now) + offset_seconds
-    return time.localtime(local_secs)
+    # Calculate local time using the internal clock (set by NTP once a sync
+    # has succeeded) and config offset
+    return time.localtime(time.time() + _UTC_OFFSET)
 
 
 def format_local_time():
     """
     Formats the current local time in a 12-hour format with AM/PM.
     Uses NTP-synchronized time when available.
+    The result only changes once per second, so repeat calls within the
+    same second return the cached string.
     """
+    global _last_fmt_sec, _last_fmt_str
+    
+    sec = int(time.time())
+    if sec == _last_fmt_sec:
+        return _last_fmt_str
+    
     local_t = get_local_time()
     
     hour_24 = local_t.tm_hour
@@ -76,4 +124,6 @@ def format_local_time():
     if hour_12 == 0:
         hour_12 = 12
 
-    return f"{hour_12}:{minute:02d}:{second:02d} {am_pm}"
+    _last_fmt_sec = sec
+    _last_fmt_str = f"{hour_12}:{minute:02d}:{second:02d} {am_pm}"
+    return _last_fmt_str
@@ -1,22 +1,42 @@
 # weather_module.py
 
 import time
+from micropython import const
 import wifi_module
-import json
 import config
-import adafruit_requests
+import logger
 
 # Cache for weather data
 _weather_data = None
 _last_weather_fetch = 0
 
+# Cached request URL, rebuilt after refresh_config()
+_weather_url = None
+
+# Config values read on every display rotation, cached by refresh_config()
+_units = None
+_fetch_interval = None
+
 # OpenWeather API settings
-API_BASE_URL = "http://api.openweathermap.org/data/2.5/weather"
+API_BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
 DEFAULT_CITY = "London"
 DEFAULT_UNITS = "metric"  # Options: metric, imperial, standard
 
 # Weather data fetch interval (default: 30 minutes)
-WEATHER_FETCH_INTERVAL = 30 * 60
+WEATHER_FETCH_INTERVAL = const(30 * 60)
+
+# Characters that don't need percent-encoding in a URL query value
+_URL_SAFE = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_.~"
+
+
+def _url_quote(text):
+    """
+    Percent-encode a URL query value (CircuitPython has no urllib).
+    """
+    return "".join(
+        chr(b) if chr(b) in _URL_SAFE else "%{:02X}".format(b)
+        for b in text.encode("utf-8")
+    )
 
 
 def get_weather_api_key():
@@ -29,13 +49,13 @@ def get_weather_api_key():
     # First check for environment variable from settings.toml
     env_key = os.getenv("WEATHER_API_KEY", "")
     if env_key:
-        print("Using weather API key from environment variables")
+        logger.log("Using weather API key from environment variables")
         return env_key
         
     # Fall back to config if no environment variable
     config_key = config.get_value("WEATHER_API_KEY", "")
     if config_key:
-        print("Using weather API key from config")
+        logger.log("Using weather API key from config")
         
     return config_key
 
@@ -47,59 +67,132 @@ def get_city():
 
 def get_units():
     """Get the configured units (metric or imperial)"""
-    return config.get_value("WEATHER_UNITS", DEFAULT_UNITS)
+    return _units
+
+
+def refresh_config():
+    """
+    Re-read the cached weather settings from config.
+    Call this after changing any WEATHER_* setting.
+    """
+    global _units, _fetch_interval, _weather_url
+    _units = config.get_value("WEATHER_UNITS", DEFAULT_UNITS)
+    _fetch_interval = config.get_value("WEATHER_FETCH_INTERVAL", WEATHER_FETCH_INTERVAL)
+    _weather_url = None  # Rebuilt from the new settings on the next fetch
+
+
+refresh_config()
+
+
+def _find_value(text, key):
+    """
+    Return the raw text of the first value for "key" in a JSON string,
+    with quotes stripped from strings, or None if not found.
+    Only handles string and number values (no nested objects).
+    """
+    tag = f'"{key}":'
+    i = text.find(tag)
+    while i >= 0:
+        start = i + len(tag)
+        while text[start:start + 1] == " ":
+            start += 1
+        if text[start:start + 1] == '"':
+            end = text.find('"', start + 1)
+            if end > 0:
+                return text[start + 1:end]
+        elif text[start:start + 1] not in ("{", "["):
+            end = start
+            while end < len(text) and text[end] not in ",}]":
+                end += 1
+            return text[start:end].strip()
+        # Value was an object or array, keep looking
+        i = text.find(tag, start)
+    return None
+
+
+def _parse_weather(text):
+    """
+    Pull just the fields we display out of an OpenWeather response.
+    
+    Returns:
+        dict: {"temp": float, "condition": str, "city": str} or None if missing
+    """
+    temp = _find_value(text, "temp")
+    condition = _find_value(text, "main")  # weather[0].main; main:{...} is skipped
+    city = _find_value(text, "name")
+    if temp is None or condition is None or city is None:
+        return None
+    return {"temp": float(temp), "condition": condition, "city": city}
+
+
+def _build_url(api_key):
+    """
+    Build the OpenWeather request URL and cache it for later fetches.
+    """
+    global _weather_url
+    city = _url_quote(get_city())
+    units = _url_quote(get_units())
+    _weather_url = f"{API_BASE_URL}?q={city}&units={units}&appid={_url_quote(api_key)}"
+    return _weather_url
 
 
 def fetch_weather():
     """
     Fetch current weather data from OpenWeather API.
     
+    Only the displayed fields are kept, rather than the whole JSON document.
+    
     Returns:
-        dict: Weather data dictionary or None if failed
+        dict: {"temp", "condition", "city"} weather dictionary or None if failed
     """
     global _weather_data, _last_weather_fetch
     
     # Check if Wi-Fi is connected
     if not wifi_module.is_connected():
-        print("Cannot fetch weather: Wi-Fi not connected")
+        logger.log("Cannot fetch weather: Wi-Fi not connected")
         return None
     
-    # Get API key
-    api_key = get_weather_api_key()
-    if not api_key:
-        print("No weather API key configured")
-        return None
+    # Build the URL on the first fetch or after a settings change
+    url = _weather_url
+    if url is None:
+        api_key = get_weather_api_key()
+        if not api_key:
+            logger.log("No weather API key configured")
+            return None
+        url = _build_url(api_key)
     
     try:
-        # Get socket and set up requests
-        pool = wifi_module.get_socket_pool()
-        if not pool:
+        # Get the shared requests session
+        requests = wifi_module.get_requests()
+        if not requests:
             return None
-            
-        requests = adafruit_requests.Session(pool)
         
-        # Build API URL
-        city = get_city()
-        units = get_units()
-        url = f"{API_BASE_URL}?q={city}&units={units}&appid={api_key}"
-        
-        print(f"Fetching weather for {city}...")
+        if logger.DEBUG:
+            logger.log(f"Fetching weather for {get_city()}...")
         response = requests.get(url)
         
-        if response.status_code == 200:
-            # Parse JSON response
-            data = response.json()
+        status_code = response.status_code
+        text = response.text
+        response.close()  # Hand the socket back to the shared session
+        
+        if status_code == 200:
+            # Scan the JSON text for the fields we need
+            data = _parse_weather(text)
+            if data is None:
+                logger.log("Weather response missing expected fields")
+                return None
             _weather_data = data
             _last_weather_fetch = time.monotonic()
-            print("Weather data updated successfully")
+            logger.log("Weather data updated successfully")
             return data
         else:
-            print(f"Weather API error: {response.status_code}")
-            print(response.text)
+            logger.log(f"Weather API error: {status_code}")
+            if logger.DEBUG:
+                logger.log(text)
             return None
             
     except Exception as e:
-        print(f"Error fetching weather: {e}")
+        logger.log(f"Error fetching weather: {e}")
         return None
 
 
@@ -111,17 +204,16 @@ def get_weather_data(force_refresh=False):
         force_refresh: If True, forces a new API call regardless of cache age
         
     Returns:
-        dict: Weather data dictionary or None if unavailable
+        dict: {"temp", "condition", "city"} weather dictionary or None if unavailable
     """
     global _weather_data, _last_weather_fetch
     
     now = time.monotonic()
-    interval = config.get_value("WEATHER_FETCH_INTERVAL", WEATHER_FETCH_INTERVAL)
     
     # Check if we need to fetch new data
     if (force_refresh or 
         _weather_data is None or 
-        (now - _last_weather_fetch) >= interval):
+        (now - _last_weather_fetch) >= _fetch_interval):
         return fetch_weather()
     
     # Return cached data
@@ -141,13 +233,12 @@ def format_weather_for_display():
     
     try:
         # Extract data
-        temp = weather["main"]["temp"]
-        condition = weather["weather"][0]["main"]
-        city = weather["name"]
+        temp = weather["temp"]
+        condition = weather["condition"]
+        city = weather["city"]
         
         # Format temperature based on units
-        units = get_units()
-        if units == "metric":
+        if _units == "metric":
             temp_str = f"{temp:.1f}°C"
         else:
             temp_str = f"{temp:.1f}°F"
@@ -158,7 +249,7 @@ def format_weather_for_display():
         
         return (line1, line2)
     except (KeyError, IndexError) as e:
-        print(f"Error formatting weather: {e}")
+        logger.log(f"Error formatting weather: {e}")
         return (None, None)
 
 
@@ -172,7 +263,9 @@ def set_city(city_name):
     Returns:
         bool: True if successful, False otherwise
     """
-    return config.set_value("WEATHER_CITY", city_name)
+    result = config.set_value("WEATHER_CITY", city_name)
+    refresh_config()
+    return result
 
 
 def set_api_key(api_key):
@@ -185,7 +278,9 @@ def set_api_key(api_key):
     Returns:
         bool: True if successful, False otherwise
     """
-    return config.set_value("WEATHER_API_KEY", api_key)
+    result = config.set_value("WEATHER_API_KEY", api_key)
+    refresh_config()
+    return result
 
 
 def set_units(units):
@@ -200,4 +295,6 @@ def set_units(units):
     """
     if units not in ["metric", "imperial", "standard"]:
         return False
-    return config.set_value("WEATHER_UNITS", units)
+    result = config.set_value("WEATHER_UNITS", units)
+    refresh_config()
+    return result
@@ -6,24 +6,33 @@ import socketpool
 import ssl
 import os
 import supervisor
+from micropython import const
+import adafruit_requests
+import logger
 
 # Cached references
 _pool = None
 _ssl_context = None
+_requests = None
 _connected = False
 _offline_mode = False
 _last_connection_attempt = 0
 _connection_attempts = 0
 
 # Maximum number of connection attempts before going to offline mode
-MAX_RETRY_ATTEMPTS = 5
+MAX_RETRY_ATTEMPTS = const(5)
 # Base delay between retries in seconds (will increase with backoff)
-BASE_RETRY_DELAY = 3
+BASE_RETRY_DELAY = const(3)
 # Maximum delay between retries in seconds
-MAX_RETRY_DELAY = 60
+MAX_RETRY_DELAY = const(60)
 # Callbacks
 _status_callback = None
 
+# Connection credentials from settings.toml; they can't change at runtime,
+# so read them once here instead of on every connection attempt
+_SSID = os.getenv("CIRCUITPY_WIFI_SSID", "DefaultSSID")
+_PASSWORD = os.getenv("CIRCUITPY_WIFI_PASSWORD", "DefaultPass")
+
 
 def set_status_callback(callback_func):
     """
@@ -38,7 +47,7 @@ def _notify_status(message):
     """Internal function to notify status via callback if set"""
     if _status_callback:
         _status_callback(message)
-    print(message)  # Always print to console as well
+    logger.log(message)  # Always log to console as well
 
 
 def ensure_wifi_connected(force_retry=False):
@@ -53,7 +62,7 @@ def ensure_wifi_connected(force_retry=False):
     Returns:
         bool: True if connected, False if in offline mode or connection failed
     """
-    global _pool, _ssl_context, _connected, _offline_mode
+    global _pool, _ssl_context, _requests, _connected, _offline_mode
     global _last_connection_attempt, _connection_attempts
 
     # If we're in offline mode and not forcing a retry, just return False
@@ -86,13 +95,10 @@ def ensure_wifi_connected(force_retry=False):
     _last_connection_attempt = now
     _connection_attempts += 1
     
-    # Get connection credentials
-    ssid = os.getenv("CIRCUITPY_WIFI_SSID", "DefaultSSID")
-    password = os.getenv("CIRCUITPY_WIFI_PASSWORD", "DefaultPass")
-    _notify_status(f"Connecting to SSID: {ssid} (attempt {_connection_attempts})...")
+    _notify_status(f"Connecting to SSID: {_SSID} (attempt {_connection_attempts})...")
 
     try:
-        wifi.radio.connect(ssid, password)
+        wifi.radio.connect(_SSID, _PASSWORD)
         _notify_status("Connected to Wi-Fi!")
         _connected = True
         _offline_mode = False
@@ -101,6 +107,7 @@ def ensure_wifi_connected(force_retry=False):
         # Initialize pool and SSL context
         _pool = socketpool.SocketPool(wifi.radio)
         _ssl_context = ssl.create_default_context()
+        _requests = None  # Session was bound to the old pool
         
         return True
         
@@ -186,6 +193,23 @@ def get_ssl_context():
     return None
 
 
+def get_requests():
+    """
+    Returns a shared adafruit_requests.Session built on the cached socket
+    pool and SSL context, so every module reuses the same session (and its
+    open connections) instead of creating a new one per request.
+    
+    Returns:
+        adafruit_requests.Session or None: The session if connected, None otherwise
+    """
+    global _requests
+    if not ensure_wifi_connected():
+        return None
+    if _requests is None:
+        _requests = adafruit_requests.Session(_pool, _ssl_context)
+    return _requests
+
+
 def is_connected():
     """
     Returns True if the radio is on and we have a known valid connection,